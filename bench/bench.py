@@ -2,87 +2,117 @@
 
 Measures check(), guard(), and guard_result() paths against MemoryStore.
 Run: python bench/bench.py
+
+Per-op cost is reported two ways:
+    best   : timeit-style, min over REPEAT runs of NUMBER calls / NUMBER
+    p50..  : distribution of single calls, one timed every BATCH calls
+
+Sampling one call per batch keeps the clock reads off the other calls, so
+the run stays close to untimed throughput while the percentiles still see
+individual slow calls. Each sample includes one perf_counter_ns() pair;
+its cost is printed as "Clock overhead".
 """
 
 from __future__ import annotations
 
 import statistics
 import time
+import timeit
+from collections.abc import Callable
 from decimal import Decimal
 
-from budgetgate import Budget, Engine, Ledger, MemoryStore, Mode, Status
-
-
-def _report(name: str, timings_ns: list[int]) -> dict[str, float]:
-    timings_us = [t / 1_000 for t in timings_ns]
-    n = len(timings_us)
-    p50 = statistics.median(timings_us)
-    p95 = sorted(timings_us)[int(n * 0.95)]
-    p99 = sorted(timings_us)[int(n * 0.99)]
-    mean = statistics.mean(timings_us)
-    mn = min(timings_us)
-    mx = max(timings_us)
+from budgetgate import Budget, Decision, Engine, Ledger, MemoryStore, Result
+
+NUMBER = 1_000
+REPEAT = 20
+BATCH = 100
+WARMUP = 200
+
+
+def _sample(op: Callable[[], object], n: int) -> list[int]:
+    """Latency (ns) of one timed call per BATCH calls, n calls in total."""
+    samples: list[int] = []
+    clock = time.perf_counter_ns
+    untimed = range(BATCH - 1)
+    for _ in range(n // BATCH):
+        for _ in untimed:
+            op()
+        start = clock()
+        op()
+        samples.append(clock() - start)
+    return samples
+
+
+def _clock_overhead() -> float:
+    """Median cost (ns) of an empty perf_counter_ns() pair."""
+    clock = time.perf_counter_ns
+    pairs = []
+    for _ in range(10_000):
+        start = clock()
+        pairs.append(clock() - start)
+    return statistics.median(pairs)
+
+
+def _run(name: str, op: Callable[[], object], n: int = 100_000) -> dict[str, float]:
+    for _ in range(WARMUP):
+        op()
+    best_ns = min(timeit.repeat(op, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+    samples_us = sorted(t / 1_000 for t in _sample(op, n))
+    count = len(samples_us)
+    best = best_ns / 1_000
+    p50 = statistics.median(samples_us)
+    p95 = samples_us[int(count * 0.95)]
+    p99 = samples_us[int(count * 0.99)]
+    mean = statistics.mean(samples_us)
 
     print(f"\n{'=' * 64}")
     print(f"  {name}")
     print(f"{'=' * 64}")
-    print(f"  Iterations : {n:,}")
-    print(f"  Mean       : {mean:>10.2f} µs")
-    print(f"  Median p50 : {p50:>10.2f} µs")
-    print(f"  p95        : {p95:>10.2f} µs")
-    print(f"  p99        : {p99:>10.2f} µs")
-    print(f"  Min        : {mn:>10.2f} µs")
-    print(f"  Max        : {mx:>10.2f} µs")
+    print(f"  Best       : {best:>10.3f} µs  ({REPEAT} x {NUMBER:,} calls)")
+    print(f"  Samples    : {count:,} single calls, 1 per {BATCH}")
+    print(f"  Mean       : {mean:>10.3f} µs")
+    print(f"  Median p50 : {p50:>10.3f} µs")
+    print(f"  p95        : {p95:>10.3f} µs")
+    print(f"  p99        : {p99:>10.3f} µs")
+    print(f"  Max        : {samples_us[-1]:>10.3f} µs")
 
-    return {"mean": mean, "p50": p50, "p95": p95, "p99": p99}
+    return {"best": best, "mean": mean, "p50": p50, "p95": p95, "p99": p99}
 
 
-def bench_check_allow(n: int = 10_000) -> list[int]:
+def bench_check_allow() -> Callable[[], Decision]:
     """Benchmark Engine.check() on the ALLOW path (fixed cost)."""
     engine = Engine(store=MemoryStore())
     ledger = Ledger("bench", "check", "user:0")
     budget = Budget(max_spend=Decimal("999999999.0"))
     engine.register(ledger, budget)
+    amount = Decimal("0.001")
 
-    # Warmup
-    for _ in range(200):
-        engine.check(ledger, Decimal("0.001"))
+    def op() -> Decision:
+        return engine.check(ledger, amount)
 
-    engine.clear(ledger)
+    assert op().allowed
+    return op
 
-    timings: list[int] = []
-    for _ in range(n):
-        start = time.perf_counter_ns()
-        decision = engine.check(ledger, Decimal("0.001"))
-        elapsed = time.perf_counter_ns() - start
-        assert decision.allowed
-        timings.append(elapsed)
 
-    return timings
-
-
-def bench_check_block(n: int = 10_000) -> list[int]:
+def bench_check_block() -> Callable[[], Decision]:
     """Benchmark Engine.check() on the BLOCK path (budget exhausted)."""
     engine = Engine(store=MemoryStore())
     ledger = Ledger("bench", "block", "user:0")
     budget = Budget(max_spend=Decimal("0.001"))
     engine.register(ledger, budget)
+    amount = Decimal("0.001")
 
     # Exhaust the budget
-    engine.check(ledger, Decimal("0.001"))
+    engine.check(ledger, amount)
 
-    timings: list[int] = []
-    for _ in range(n):
-        start = time.perf_counter_ns()
-        decision = engine.check(ledger, Decimal("0.001"))
-        elapsed = time.perf_counter_ns() - start
-        assert decision.blocked
-        timings.append(elapsed)
+    def op() -> Decision:
+        return engine.check(ledger, amount)
 
-    return timings
+    assert op().blocked
+    return op
 
 
-def bench_guard_decorator(n: int = 10_000) -> list[int]:
+def bench_guard_decorator() -> Callable[[], int]:
     """Benchmark @engine.guard() decorator overhead (ALLOW, fixed cost)."""
     engine = Engine(store=MemoryStore())
     ledger = Ledger("bench", "guard", "user:0")
@@ -92,24 +122,11 @@ def bench_guard_decorator(n: int = 10_000) -> list[int]:
     def noop() -> int:
         return 42
 
-    # Warmup
-    for _ in range(200):
-        noop()
-
-    engine.clear(ledger)
-
-    timings: list[int] = []
-    for _ in range(n):
-        start = time.perf_counter_ns()
-        result = noop()
-        elapsed = time.perf_counter_ns() - start
-        assert result == 42
-        timings.append(elapsed)
+    assert noop() == 42
+    return noop
 
-    return timings
 
-
-def bench_guard_result_decorator(n: int = 10_000) -> list[int]:
+def bench_guard_result_decorator() -> Callable[[], Result[int]]:
     """Benchmark @engine.guard_result() decorator overhead (ALLOW, fixed cost)."""
     engine = Engine(store=MemoryStore())
     ledger = Ledger("bench", "guard_result", "user:0")
@@ -119,47 +136,34 @@ def bench_guard_result_decorator(n: int = 10_000) -> list[int]:
     def noop() -> int:
         return 42
 
-    # Warmup
-    for _ in range(200):
-        noop()
-
-    engine.clear(ledger)
-
-    timings: list[int] = []
-    for _ in range(n):
-        start = time.perf_counter_ns()
-        result = noop()
-        elapsed = time.perf_counter_ns() - start
-        assert result.ok
-        assert result.unwrap() == 42
-        timings.append(elapsed)
-
-    return timings
+    result = noop()
+    assert result.ok
+    assert result.unwrap() == 42
+    return noop
 
 
 def main() -> None:
     print("BudgetGate Benchmark")
-    print(f"Python perf_counter_ns resolution: ~{time.get_clock_info('perf_counter').resolution * 1e9:.0f} ns")
+    resolution_ns = time.get_clock_info("perf_counter").resolution * 1e9
+    print(f"Python perf_counter_ns resolution: ~{resolution_ns:.0f} ns")
+    print(f"Clock overhead per sample: ~{_clock_overhead():.0f} ns")
 
     results: dict[str, dict[str, float]] = {}
-
-    timings = bench_check_allow()
-    results["check (ALLOW)"] = _report("Engine.check() — ALLOW path", timings)
-
-    timings = bench_check_block()
-    results["check (BLOCK)"] = _report("Engine.check() — BLOCK path", timings)
-
-    timings = bench_guard_decorator()
-    results["guard"] = _report("@engine.guard() — ALLOW path", timings)
-
-    timings = bench_guard_result_decorator()
-    results["guard_result"] = _report("@engine.guard_result() — ALLOW path", timings)
+    results["check (ALLOW)"] = _run("Engine.check() — ALLOW path", bench_check_allow())
+    results["check (BLOCK)"] = _run("Engine.check() — BLOCK path", bench_check_block())
+    results["guard"] = _run("@engine.guard() — ALLOW path", bench_guard_decorator())
+    results["guard_result"] = _run(
+        "@engine.guard_result() — ALLOW path", bench_guard_result_decorator(),
+    )
 
     print(f"\n{'=' * 64}")
     print("  Summary")
     print(f"{'=' * 64}")
     for name, r in results.items():
-        print(f"  {name:<25s}  p50={r['p50']:.2f}µs  p99={r['p99']:.2f}µs")
+        print(
+            f"  {name:<25s}  best={r['best']:.3f}µs"
+            f"  p50={r['p50']:.3f}µs  p99={r['p99']:.3f}µs"
+        )
 
 
 if __name__ == "__main__":
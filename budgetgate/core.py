@@ -2,9 +2,60 @@
 
 from __future__ import annotations
 
+import functools
+import math
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum, auto
+from typing import Literal
+
+# Fixed-point scale for in-memory accounting: 1 unit = 10**-6 of the currency.
+# Amounts finer than that stay exact as scaled Decimals, which mix exactly
+# with ints in sums and comparisons, so int is only the fast path.
+_PLACES = 6
+_ZERO = Decimal("0")
+_Units = int | Decimal
+
+# Per exponent 0 .. -_PLACES: (divisor from micro-units, 10**exponent).
+_UNIT_SCALES = {
+    -e: (10 ** (_PLACES - e), Decimal(1).scaleb(-e)) for e in range(_PLACES + 1)
+}
+
+
+def _to_units(amount: Decimal) -> tuple[_Units, int]:
+    """Convert a Decimal amount to (micro-units, decimal exponent).
+
+    The exponent lets totals be rendered at the scale Decimal addition of
+    the original amounts would have produced.
+    """
+    if amount.__class__ is not Decimal and not isinstance(amount, (Decimal, int)):
+        # str() would otherwise let floats and strings through the cache.
+        raise TypeError(f"amount must be a Decimal or int, got {type(amount).__name__}")
+    # Keyed by str, not the Decimal: 1.5 == 1.50, but their exponents differ.
+    return _parse_units(str(amount))
+
+
+# Request amounts repeat (per-call prices, fixed costs), so memoize them.
+@functools.lru_cache(maxsize=4096)
+def _parse_units(text: str) -> tuple[_Units, int]:
+    amount = Decimal(text)
+    exp = amount.as_tuple().exponent
+    if not isinstance(exp, int):
+        raise ValueError(f"amount must be finite, got {amount}")
+    scaled = amount.scaleb(_PLACES)
+    if exp >= -_PLACES:
+        return int(scaled), exp
+    return scaled, exp
+
+
+def _from_units(units: _Units, exp: int = 0) -> Decimal:
+    """Convert micro-units back to a Decimal amount with exponent exp."""
+    scale = _UNIT_SCALES.get(exp)
+    if scale is not None and units.__class__ is int:
+        # Exact: every amount in the total has an exponent >= exp, and the
+        # product takes the quantum's exponent.
+        return Decimal(units // scale[0]) * scale[1]
+    return Decimal(units).scaleb(-_PLACES).quantize(Decimal(1).scaleb(exp))
 
 
 class Mode(Enum):
@@ -31,8 +82,18 @@ class BlockReason(Enum):
     STORE_ERROR = auto()      # Backend failure
 
 
+class _LedgerCache:
+    """Derived string forms and hash, kept out of Ledger's dataclass fields."""
+
+    __slots__ = ("_str", "_path", "_key", "_hash")
+    _str: str
+    _path: str
+    _key: str
+    _hash: int
+
+
 @dataclass(frozen=True, slots=True)
-class Ledger:
+class Ledger(_LedgerCache):
     """Identifies a spend-tracked stream.
 
     Examples:
@@ -44,17 +105,42 @@ class Ledger:
     resource: str
     principal: str = "global"
 
+    def __post_init__(self) -> None:
+        # Immutable, so compute the string forms and hash once: ledgers key
+        # every store/registry dict, name Redis keys, and appear in
+        # audit/listener output.
+        object.__setattr__(self, "_str", f"{self.namespace}:{self.resource}@{self.principal}")
+        path = f"{self.namespace}:{self.resource}:{self.principal}"
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_key", f"bg:{path}")
+        object.__setattr__(self, "_hash", hash((self.namespace, self.resource, self.principal)))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type[Ledger], tuple[str, str, str]]:
+        # Pickle only the fields and rebuild the caches: string hashes are
+        # salted per process (PYTHONHASHSEED), so _hash must be recomputed.
+        return (Ledger, (self.namespace, self.resource, self.principal))
+
     def __str__(self) -> str:
-        return f"{self.namespace}:{self.resource}@{self.principal}"
+        return self._str
 
     @property
     def key(self) -> str:
         """Redis-friendly key string."""
-        return f"bg:{self.namespace}:{self.resource}:{self.principal}"
+        return self._key
+
+
+class _BudgetCache:
+    """The limit in store units, kept out of Budget's dataclass fields."""
+
+    __slots__ = ("_max_units",)
+    _max_units: _Units | float
 
 
 @dataclass(frozen=True, slots=True)
-class Budget:
+class Budget(_BudgetCache):
     """Spend policy.
 
     Args:
@@ -69,36 +155,107 @@ class Budget:
     on_store_error: StoreErrorMode = StoreErrorMode.FAIL_CLOSED
 
     def __post_init__(self) -> None:
+        if isinstance(self.max_spend, int):
+            object.__setattr__(self, "max_spend", Decimal(self.max_spend))
+        elif not isinstance(self.max_spend, Decimal):
+            raise TypeError(
+                f"max_spend must be a Decimal or int, got {type(self.max_spend).__name__}"
+            )
         if self.max_spend < 0:
             raise ValueError("max_spend must be >= 0")
         if self.window is not None and self.window <= 0:
             raise ValueError("window must be > 0 or None")
+        if self.max_spend.is_infinite():
+            max_units: _Units | float = math.inf
+        else:
+            max_units = _to_units(self.max_spend)[0]
+        object.__setattr__(self, "_max_units", max_units)
+
+    def __reduce__(
+        self,
+    ) -> tuple[type[Budget], tuple[Decimal, float | None, Mode, StoreErrorMode]]:
+        # The generated slots __getstate__ covers fields only; rebuild
+        # _max_units through __init__.
+        return (Budget, (self.max_spend, self.window, self.mode, self.on_store_error))
 
 
-@dataclass(frozen=True, slots=True)
 class Decision:
-    """Result of evaluating a spend against its budget."""
-    status: Status
-    ledger: Ledger
-    budget: Budget
-    reason: BlockReason | None = None
-    message: str | None = None
-    spent_in_window: Decimal = Decimal("0")
-    requested: Decimal = Decimal("0")
-    remaining: Decimal = Decimal("0")
+    """Result of evaluating a spend against its budget.
+
+    A plain slotted class rather than a frozen dataclass: one is built on
+    every check(), and a frozen dataclass pays object.__setattr__ per field.
+    Treat instances as immutable.
+    """
+
+    __slots__ = (
+        "status", "ledger", "budget", "reason", "_message",
+        "spent_in_window", "requested", "remaining",
+    )
+
+    def __init__(
+        self,
+        status: Status,
+        ledger: Ledger,
+        budget: Budget,
+        reason: BlockReason | None = None,
+        message: str | None = None,
+        spent_in_window: Decimal = _ZERO,
+        requested: Decimal = _ZERO,
+        remaining: Decimal = _ZERO,
+    ) -> None:
+        self.status = status
+        self.ledger = ledger
+        self.budget = budget
+        self.reason = reason
+        self._message = message
+        self.spent_in_window = spent_in_window
+        self.requested = requested
+        self.remaining = remaining
+
+    @property
+    def message(self) -> str | None:
+        # Budget blocks format their message on first access only.
+        if self._message is None and self.reason is BlockReason.BUDGET_EXCEEDED:
+            self._message = (
+                f"Budget exceeded: {self.spent_in_window} + {self.requested}"
+                f" > {self.budget.max_spend}"
+            )
+        return self._message
 
     @property
     def allowed(self) -> bool:
-        return self.status == Status.ALLOW
+        return self.status is Status.ALLOW
 
     @property
     def blocked(self) -> bool:
-        return self.status == Status.BLOCK
+        return self.status is Status.BLOCK
 
     def __bool__(self) -> bool:
         """Truthy = allowed."""
         return self.allowed
 
+    def _fields(self) -> tuple[object, ...]:
+        return (
+            self.status, self.ledger, self.budget, self.reason, self.message,
+            self.spent_in_window, self.requested, self.remaining,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __repr__(self) -> str:
+        return (
+            f"Decision(status={self.status!r}, ledger={self.ledger!r}, "
+            f"budget={self.budget!r}, reason={self.reason!r}, "
+            f"message={self.message!r}, spent_in_window={self.spent_in_window!r}, "
+            f"requested={self.requested!r}, remaining={self.remaining!r})"
+        )
+
     def to_dict(self) -> dict[str, object]:
         """Serialize for audit composition."""
         return {
@@ -113,13 +270,17 @@ class Decision:
         }
 
 
-class _Missing:
-    """Sentinel for distinguishing None from missing value."""
-    __slots__ = ()
+class _Missing(Enum):
+    """Sentinel for distinguishing None from missing value.
+
+    A single-member enum so `is MISSING` narrows types like isinstance did.
+    """
+    MISSING = auto()
+
     def __repr__(self) -> str:
         return "<MISSING>"
 
-MISSING = _Missing()
+MISSING = _Missing.MISSING
 
 
 @dataclass(frozen=True, slots=True)
@@ -131,31 +292,31 @@ class Result[T]:
     - Function was blocked (no value)
     """
     decision: Decision
-    _value: T | _Missing = MISSING
+    _value: T | Literal[_Missing.MISSING] = MISSING
 
     @property
     def ok(self) -> bool:
-        return self.decision.allowed
+        return self.decision.status is Status.ALLOW
 
     @property
     def has_value(self) -> bool:
-        return not isinstance(self._value, _Missing)
+        return self._value is not MISSING
 
     @property
     def value(self) -> T | None:
         """Get value or None if blocked/missing."""
-        if isinstance(self._value, _Missing):
+        if self._value is MISSING:
             return None
         return self._value
 
     def unwrap(self) -> T:
         """Get value or raise if blocked."""
-        if isinstance(self._value, _Missing):
+        if self._value is MISSING:
             raise ValueError(f"No value: {self.decision.message or 'blocked'}")
         return self._value
 
     def unwrap_or(self, default: T) -> T:
         """Get value or return default if blocked."""
-        if isinstance(self._value, _Missing):
+        if self._value is MISSING:
             return default
         return self._value
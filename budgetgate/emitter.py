@@ -27,12 +27,20 @@ class Emitter:
 
     def emit(self, event: Any) -> None:
         """Notify all listeners. Exceptions are swallowed and counted."""
-        for listener in self._listeners:
+        listeners = self._listeners
+        if not listeners:
+            return
+        for listener in listeners:
             try:
                 listener(event)
             except Exception:
                 self._errors += 1
 
+    @property
+    def listeners(self) -> list[Callable[[Any], None]]:
+        """Live list of registered listeners (do not mutate; use add())."""
+        return self._listeners
+
     @property
     def error_count(self) -> int:
         """Number of listener exceptions (never blocks execution)."""
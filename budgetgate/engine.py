@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import inspect
 import time
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Sequence
 from decimal import Decimal
 from functools import wraps
 from typing import ParamSpec, TypeVar
 
 from .core import (
+    _ZERO,
     BlockReason,
     Budget,
     Decision,
@@ -24,19 +26,33 @@ from .store import AsyncMemoryStore, AsyncStore, MemoryStore, Store
 P = ParamSpec("P")
 T = TypeVar("T")
 
+# Shared default for unregistered ledgers (Budget is immutable).
+_UNLIMITED = Budget(max_spend=Decimal("Infinity"))
+
+
+def _takes_no_args(fn: Callable[..., object]) -> bool:
+    """True if fn declares no parameters, so wrappers can skip arg packing."""
+    try:
+        # Not through __wrapped__: a functools.wraps decorator may accept
+        # arguments the function it wraps does not.
+        return not inspect.signature(fn, follow_wrapped=False).parameters
+    except (TypeError, ValueError):
+        return False
+
 
 class BudgetExceededError(RuntimeError):
     """Raised when spend would exceed budget in HARD mode."""
 
     def __init__(self, decision: Decision) -> None:
-        super().__init__(decision.message or f"Budget exceeded: {decision.reason}")
+        # All BaseException.__init__ does is store args; set them directly.
+        self.args = (decision.message or f"Budget exceeded: {decision.reason}",)
         self.decision = decision
 
 
 class Engine:
     """BudgetGate engine for spend limiting agent actions."""
 
-    __slots__ = ("_store", "_async_store", "_clock", "_budgets", "_emitter")
+    __slots__ = ("_store", "_async_store", "_clock", "_budgets", "_emitter", "_listeners")
 
     def __init__(
         self,
@@ -50,6 +66,7 @@ class Engine:
         self._clock = clock or time.monotonic
         self._budgets: dict[Ledger, Budget] = {}
         self._emitter = emitter or Emitter()
+        self._listeners = self._emitter.listeners
 
     # ─────────────────────────────────────────────────────────────
     # Configuration
@@ -59,7 +76,7 @@ class Engine:
         self._budgets[ledger] = budget
 
     def budget_for(self, ledger: Ledger) -> Budget:
-        return self._budgets.get(ledger, Budget(max_spend=Decimal("Infinity")))
+        return self._budgets.get(ledger, _UNLIMITED)
 
     def on_decision(self, listener: Callable[[Decision], None]) -> None:
         self._emitter.add(listener)
@@ -76,7 +93,13 @@ class Engine:
         self, ledger: Ledger, amount: Decimal, budget: Budget | None = None,
     ) -> Decision:
         now = self._clock()
-        budget = budget or self.budget_for(ledger)
+        if budget is None:
+            budget = self._budgets.get(ledger, _UNLIMITED)
+        return self._check_at(ledger, now, amount, budget)
+
+    def _check_at(
+        self, ledger: Ledger, now: float, amount: Decimal, budget: Budget,
+    ) -> Decision:
         try:
             total_spent, allowed = self._store.check_and_reserve(
                 ledger, now, amount, budget,
@@ -84,22 +107,33 @@ class Engine:
         except Exception as e:
             return self._handle_store_error(ledger, budget, amount, e)
         if allowed:
-            remaining = max(Decimal("0"), budget.max_spend - total_spent)
-            return self._decide(
-                ledger, budget, amount, status=Status.ALLOW,
-                spent_in_window=total_spent, remaining=remaining,
-            )
-        remaining = max(Decimal("0"), budget.max_spend - total_spent)
-        msg = (
-            f"Budget exceeded: {total_spent} + {amount}"
-            f" > {budget.max_spend}"
-        )
-        return self._decide(
-            ledger, budget, amount, status=Status.BLOCK,
-            reason=BlockReason.BUDGET_EXCEEDED,
-            message=msg,
-            spent_in_window=total_spent, remaining=remaining,
-        )
+            return self._allow(ledger, budget, amount, total_spent)
+        return self._block(ledger, budget, amount, total_spent)
+
+    def check_many(
+        self,
+        ledger: Ledger,
+        amounts: Sequence[Decimal],
+        budget: Budget | None = None,
+    ) -> list[Decision]:
+        """Evaluate several spends on one ledger, in order.
+
+        Equivalent to calling check() for each amount at one timestamp.
+        Stores that provide check_and_reserve_many() answer the whole batch
+        in a single call; others fall back to one check_and_reserve() per
+        amount, all at the same timestamp.
+        """
+        now = self._clock()
+        if budget is None:
+            budget = self._budgets.get(ledger, _UNLIMITED)
+        batch = getattr(self._store, "check_and_reserve_many", None)
+        if batch is None:
+            return [self._check_at(ledger, now, a, budget) for a in amounts]
+        try:
+            outcomes = batch(ledger, now, amounts, budget)
+        except Exception as e:
+            return [self._handle_store_error(ledger, budget, a, e) for a in amounts]
+        return self._decide_many(ledger, budget, amounts, outcomes)
 
     def reserve(
         self,
@@ -108,7 +142,8 @@ class Engine:
         budget: Budget | None = None,
     ) -> tuple[str | None, Decision]:
         now = self._clock()
-        budget = budget or self.budget_for(ledger)
+        if budget is None:
+            budget = self._budgets.get(ledger, _UNLIMITED)
         try:
             res_id, total_spent = self._store.reserve(
                 ledger, now, estimate, budget,
@@ -118,22 +153,8 @@ class Engine:
                 ledger, budget, estimate, e,
             )
         if res_id is not None:
-            remaining = max(Decimal("0"), budget.max_spend - total_spent)
-            return res_id, self._decide(
-                ledger, budget, estimate, status=Status.ALLOW,
-                spent_in_window=total_spent, remaining=remaining,
-            )
-        remaining = max(Decimal("0"), budget.max_spend - total_spent)
-        msg = (
-            f"Budget exceeded: {total_spent} + {estimate}"
-            f" > {budget.max_spend}"
-        )
-        return None, self._decide(
-            ledger, budget, estimate, status=Status.BLOCK,
-            reason=BlockReason.BUDGET_EXCEEDED,
-            message=msg,
-            spent_in_window=total_spent, remaining=remaining,
-        )
+            return res_id, self._allow(ledger, budget, estimate, total_spent)
+        return None, self._block(ledger, budget, estimate, total_spent)
 
     def commit(self, reservation_id: str, actual: Decimal) -> None:
         self._store.commit(reservation_id, actual)
@@ -142,14 +163,16 @@ class Engine:
         self._store.release(reservation_id)
 
     def enforce(self, decision: Decision) -> None:
-        if decision.blocked and decision.budget.mode == Mode.HARD:
+        if decision.blocked and decision.budget.mode is Mode.HARD:
             raise BudgetExceededError(decision)
 
     def get_remaining(self, ledger: Ledger, budget: Budget | None = None) -> Decimal:
         now = self._clock()
-        budget = budget or self.budget_for(ledger)
+        if budget is None:
+            budget = self._budgets.get(ledger, _UNLIMITED)
         spent = self._store.get_spend(ledger, now, budget.window)
-        return max(Decimal("0"), budget.max_spend - spent)
+        remaining = budget.max_spend - spent
+        return remaining if remaining > _ZERO else _ZERO
 
     def clear(self, ledger: Ledger) -> None:
         self._store.clear(ledger)
@@ -167,10 +190,20 @@ class Engine:
         if budget is not None:
             self.register(ledger, budget)
         def decorator(fn: Callable[P, T]) -> Callable[P, T]:
+            check, blocked = self.check, Status.BLOCK
+            if _takes_no_args(fn):
+                @wraps(fn)
+                def wrapper0() -> T:
+                    decision = check(ledger, cost)
+                    if decision.status is blocked:
+                        raise BudgetExceededError(decision)
+                    return fn()  # type: ignore[call-arg]
+                return wrapper0  # type: ignore[return-value]
+
             @wraps(fn)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-                decision = self.check(ledger, cost)
-                if decision.blocked:
+                decision = check(ledger, cost)
+                if decision.status is blocked:
                     raise BudgetExceededError(decision)
                 return fn(*args, **kwargs)
             return wrapper
@@ -187,21 +220,24 @@ class Engine:
         if budget is not None:
             self.register(ledger, budget)
         def decorator(fn: Callable[P, T]) -> Callable[P, T]:
+            reserve, commit, release = self.reserve, self.commit, self.release
+            blocked = Status.BLOCK
+
             @wraps(fn)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-                res_id, decision = self.reserve(ledger, estimate)
-                if decision.blocked:
+                res_id, decision = reserve(ledger, estimate)
+                if decision.status is blocked:
                     raise BudgetExceededError(decision)
                 try:
                     result = fn(*args, **kwargs)
                     actual_cost = actual(result)
-                    self.commit(res_id, actual_cost)  # type: ignore[arg-type]
+                    commit(res_id, actual_cost)  # type: ignore[arg-type]
                     return result
                 except BudgetExceededError:
                     raise
                 except Exception:
                     if res_id is not None:
-                        self.release(res_id)
+                        release(res_id)
                     raise
             return wrapper
         return decorator
@@ -212,10 +248,12 @@ class Engine:
         if budget is not None:
             self.register(ledger, budget)
         def decorator(fn: Callable[P, T]) -> Callable[P, Result[T]]:
+            check, blocked = self.check, Status.BLOCK
+
             @wraps(fn)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[T]:
-                decision = self.check(ledger, cost)
-                if decision.blocked:
+                decision = check(ledger, cost)
+                if decision.status is blocked:
                     return Result(decision=decision)
                 value = fn(*args, **kwargs)
                 return Result(decision=decision, _value=value)
@@ -233,19 +271,22 @@ class Engine:
         if budget is not None:
             self.register(ledger, budget)
         def decorator(fn: Callable[P, T]) -> Callable[P, Result[T]]:
+            reserve, commit, release = self.reserve, self.commit, self.release
+            blocked = Status.BLOCK
+
             @wraps(fn)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[T]:
-                res_id, decision = self.reserve(ledger, estimate)
-                if decision.blocked:
+                res_id, decision = reserve(ledger, estimate)
+                if decision.status is blocked:
                     return Result(decision=decision)
                 try:
                     result = fn(*args, **kwargs)
                     actual_cost = actual(result)
-                    self.commit(res_id, actual_cost)  # type: ignore[arg-type]
+                    commit(res_id, actual_cost)  # type: ignore[arg-type]
                     return Result(decision=decision, _value=result)
                 except Exception:
                     if res_id is not None:
-                        self.release(res_id)
+                        release(res_id)
                     raise
             return wrapper
         return decorator
@@ -259,7 +300,13 @@ class Engine:
     ) -> Decision:
         """Async version of check(). Uses async_store backend."""
         now = self._clock()
-        budget = budget or self.budget_for(ledger)
+        if budget is None:
+            budget = self._budgets.get(ledger, _UNLIMITED)
+        return await self._async_check_at(ledger, now, amount, budget)
+
+    async def _async_check_at(
+        self, ledger: Ledger, now: float, amount: Decimal, budget: Budget
+    ) -> Decision:
         try:
             total_spent, allowed = await self._async_store.check_and_reserve(
                 ledger, now, amount, budget
@@ -267,22 +314,33 @@ class Engine:
         except Exception as e:
             return self._handle_store_error(ledger, budget, amount, e)
         if allowed:
-            remaining = max(Decimal("0"), budget.max_spend - total_spent)
-            return self._decide(
-                ledger, budget, amount, status=Status.ALLOW,
-                spent_in_window=total_spent, remaining=remaining,
-            )
-        remaining = max(Decimal("0"), budget.max_spend - total_spent)
-        return self._decide(
-            ledger, budget, amount, status=Status.BLOCK,
-            reason=BlockReason.BUDGET_EXCEEDED,
-            message=f"Budget exceeded: {total_spent} + {amount} > {budget.max_spend}",
-            spent_in_window=total_spent, remaining=remaining,
-        )
+            return self._allow(ledger, budget, amount, total_spent)
+        return self._block(ledger, budget, amount, total_spent)
+
+    async def async_check_many(
+        self,
+        ledger: Ledger,
+        amounts: Sequence[Decimal],
+        budget: Budget | None = None,
+    ) -> list[Decision]:
+        """Async version of check_many(). Uses async_store backend."""
+        now = self._clock()
+        if budget is None:
+            budget = self._budgets.get(ledger, _UNLIMITED)
+        batch = getattr(self._async_store, "check_and_reserve_many", None)
+        if batch is None:
+            return [
+                await self._async_check_at(ledger, now, a, budget) for a in amounts
+            ]
+        try:
+            outcomes = await batch(ledger, now, amounts, budget)
+        except Exception as e:
+            return [self._handle_store_error(ledger, budget, a, e) for a in amounts]
+        return self._decide_many(ledger, budget, amounts, outcomes)
 
     async def async_enforce(self, decision: Decision) -> None:
         """Async version of enforce(). Raises BudgetExceededError in HARD mode."""
-        if decision.blocked and decision.budget.mode == Mode.HARD:
+        if decision.blocked and decision.budget.mode is Mode.HARD:
             raise BudgetExceededError(decision)
 
     def async_guard(
@@ -302,10 +360,12 @@ class Engine:
         def decorator(
             fn: Callable[P, Coroutine[object, object, T]],
         ) -> Callable[P, Coroutine[object, object, T]]:
+            check, blocked = self.async_check, Status.BLOCK
+
             @wraps(fn)
             async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-                decision = await self.async_check(ledger, cost)
-                if decision.blocked:
+                decision = await check(ledger, cost)
+                if decision.status is blocked:
                     raise BudgetExceededError(decision)
                 return await fn(*args, **kwargs)
             return wrapper
@@ -328,10 +388,12 @@ class Engine:
         def decorator(
             fn: Callable[P, Coroutine[object, object, T]],
         ) -> Callable[P, Coroutine[object, object, Result[T]]]:
+            check, blocked = self.async_check, Status.BLOCK
+
             @wraps(fn)
             async def wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[T]:
-                decision = await self.async_check(ledger, cost)
-                if decision.blocked:
+                decision = await check(ledger, cost)
+                if decision.status is blocked:
                     return Result(decision=decision)
                 value = await fn(*args, **kwargs)
                 return Result(decision=decision, _value=value)
@@ -349,7 +411,7 @@ class Engine:
         amount: Decimal,
         error: Exception,
     ) -> Decision:
-        if budget.on_store_error == StoreErrorMode.FAIL_OPEN:
+        if budget.on_store_error is StoreErrorMode.FAIL_OPEN:
             return self._decide(
                 ledger, budget, amount, status=Status.ALLOW,
                 reason=BlockReason.STORE_ERROR,
@@ -361,6 +423,54 @@ class Engine:
             message=f"Store error (fail-closed): {error}",
         )
 
+    def _decide_many(
+        self,
+        ledger: Ledger,
+        budget: Budget,
+        amounts: Sequence[Decimal],
+        outcomes: Sequence[tuple[Decimal, bool]],
+    ) -> list[Decision]:
+        """Build (and emit) decisions for a check_and_reserve_many() batch."""
+        allow, block = self._allow, self._block
+        return [
+            (allow if allowed else block)(ledger, budget, amount, total_spent)
+            for amount, (total_spent, allowed) in zip(amounts, outcomes, strict=True)
+        ]
+
+    def _allow(
+        self,
+        ledger: Ledger,
+        budget: Budget,
+        amount: Decimal,
+        total_spent: Decimal,
+    ) -> Decision:
+        """Hot path for an allowed decision: positional, no keyword defaults."""
+        remaining = budget.max_spend - total_spent
+        remaining = remaining if remaining > _ZERO else _ZERO
+        decision = Decision(
+            Status.ALLOW, ledger, budget, None, None,
+            total_spent, amount, remaining,
+        )
+        if self._listeners:
+            self._emitter.emit(decision)
+        return decision
+
+    def _block(
+        self,
+        ledger: Ledger,
+        budget: Budget,
+        amount: Decimal,
+        total_spent: Decimal,
+    ) -> Decision:
+        """Cold path for a budget-exceeded decision (kept out of check())."""
+        remaining = budget.max_spend - total_spent
+        remaining = remaining if remaining > _ZERO else _ZERO
+        return self._decide(
+            ledger, budget, amount, status=Status.BLOCK,
+            reason=BlockReason.BUDGET_EXCEEDED,
+            spent_in_window=total_spent, remaining=remaining,
+        )
+
     def _decide(
         self,
         ledger: Ledger,
@@ -370,14 +480,13 @@ class Engine:
         status: Status,
         reason: BlockReason | None = None,
         message: str | None = None,
-        spent_in_window: Decimal = Decimal("0"),
-        remaining: Decimal = Decimal("0"),
+        spent_in_window: Decimal = _ZERO,
+        remaining: Decimal = _ZERO,
     ) -> Decision:
         decision = Decision(
-            status=status, ledger=ledger, budget=budget,
-            reason=reason, message=message,
-            spent_in_window=spent_in_window,
-            requested=amount, remaining=remaining,
+            status, ledger, budget, reason, message,
+            spent_in_window, amount, remaining,
         )
-        self._emitter.emit(decision)
+        if self._listeners:
+            self._emitter.emit(decision)
         return decision
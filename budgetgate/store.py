@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
+import operator
 import secrets
 import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Sequence
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import TYPE_CHECKING, Protocol
 from uuid import uuid4
 
-from .core import Budget, Ledger
+from .core import _ZERO, Budget, Ledger, _from_units, _to_units, _Units
 
 if TYPE_CHECKING:
     from redis import Redis  # type: ignore[import-not-found]
@@ -25,11 +29,11 @@ class SpendEvent:
 
 @dataclass(slots=True)
 class Reservation:
-    """A pending spend reservation."""
+    """A pending spend reservation (amount in micro-units)."""
     id: str
     ledger: Ledger
     ts: float
-    amount: Decimal
+    amount: _Units
 
 
 class Store(Protocol):
@@ -159,53 +163,248 @@ class AsyncStore(Protocol):
         ...
 
 
-class MemoryStore:
-    """Thread-safe in-memory spend store with reservation support.
+# Out-of-order spends landing at most this far from the tail are inserted
+# in place; deeper ones go through _LedgerState.late.
+_SHIFT_LIMIT = 64
+
 
-    Lock ordering (must always acquire in this order to prevent deadlock):
-        1. _global_lock
-        2. ledger-specific lock from _locks
+class _LedgerState:
+    """Committed spends and open reservations for one ledger.
 
-    All methods that need both locks acquire global first, then ledger.
+    Amounts are micro-units: ints, or exact Decimals when finer than that.
     """
 
-    __slots__ = ("_ledgers", "_reservations", "_locks", "_global_lock")
+    __slots__ = (
+        "ts", "cum", "base", "total", "late",
+        "reservations", "res_keys", "res_split", "reserved", "exp",
+    )
 
     def __init__(self) -> None:
-        self._ledgers: dict[Ledger, list[SpendEvent]] = {}
-        self._reservations: dict[str, Reservation] = {}
-        self._locks: dict[Ledger, threading.Lock] = {}
-        self._global_lock = threading.Lock()
+        # Spends as parallel lists, so recording one allocates no object:
+        # sorted timestamps and prefix sums, where cum[i] is everything up
+        # to ts[i] and `base` is the sum already pruned away. A window total
+        # is one bisection and one subtraction.
+        self.ts: list[float] = []
+        self.cum: list[_Units] = []
+        self.base: _Units = 0
+        self.total: _Units = 0  # all retained spends, `late` included
+        # Sorted (ts, amount) spends too deep to insert into cum; see add().
+        self.late: list[tuple[float, _Units]] = []
+        # Open reservations by id, plus (ts, id) keys kept sorted: callers
+        # may reserve out of timestamp order. Keys from res_split on are at
+        # or after the last cutoff asked about, and `reserved` is their sum.
+        self.reservations: dict[str, Reservation] = {}
+        self.res_keys: list[tuple[float, str]] = []
+        self.res_split = 0
+        self.reserved: _Units = 0
+        # Smallest decimal exponent recorded, so totals keep the amounts'
+        # scale ("1.50" + "2" is "3.50"); reset only once the ledger empties.
+        self.exp = 0
+
+    def prune(self, cutoff: float) -> None:
+        """Drop spends older than cutoff."""
+        ts = self.ts
+        if ts and ts[0] < cutoff:
+            i = bisect_left(ts, cutoff)
+            cum = self.cum
+            self.total -= cum[i - 1] - self.base
+            self.base = cum[i - 1]
+            del ts[:i]
+            del cum[:i]
+        late = self.late
+        if late and late[0][0] < cutoff:
+            j = bisect_left(late, (cutoff,))
+            self.total -= sum(amount for _, amount in late[:j])
+            del late[:j]
+        if not ts and not late and not self.reservations:
+            self.exp = 0
+
+    def spent_since(self, cutoff: float) -> _Units:
+        """Committed total at or after cutoff, without pruning."""
+        spent = self.total
+        ts = self.ts
+        if ts and ts[0] < cutoff:
+            i = bisect_left(ts, cutoff)
+            spent -= self.cum[i - 1] - self.base
+        late = self.late
+        if late and late[0][0] < cutoff:
+            j = bisect_left(late, (cutoff,))
+            spent -= sum(amount for _, amount in late[:j])
+        return spent
+
+    def add(self, ts: float, amount: _Units, exp: int) -> None:
+        """Record a spend, preserving timestamp order."""
+        if exp < self.exp:
+            self.exp = exp
+        times = self.ts
+        cum = self.cum
+        if not times or times[-1] <= ts:
+            times.append(ts)
+            cum.append((cum[-1] if cum else self.base) + amount)
+        else:
+            # Out of order: a commit carries its reservation's timestamp.
+            # Near the tail, shift the later prefix sums in place; deeper,
+            # park it in `late`, folded back once it outgrows sqrt(n), so a
+            # deep insert costs O(sqrt n) amortized instead of O(n).
+            i = bisect_right(times, ts)
+            if len(times) - i <= _SHIFT_LIMIT:
+                times.insert(i, ts)
+                cum.insert(i, (cum[i - 1] if i else self.base) + amount)
+                for j in range(i + 1, len(cum)):
+                    cum[j] += amount
+            else:
+                late = self.late
+                insort(late, (ts, amount))
+                if len(late) ** 2 > len(times):
+                    self._fold()
+        self.total += amount
+
+    def _fold(self) -> None:
+        """Merge `late` into ts/cum, rebuilding the prefix sums after it."""
+        late = self.late
+        times = self.ts
+        cum = self.cum
+        i = bisect_right(times, late[0][0])
+        prev = cum[i - 1] if i else self.base
+        amounts = map(operator.sub, cum[i:], [prev, *cum[i:-1]])
+        tail = sorted([*zip(times[i:], amounts, strict=True), *late])
+        times[i:] = [t for t, _ in tail]
+        cum[i:] = itertools.accumulate(
+            [amount for _, amount in tail], initial=prev,
+        )
+        del cum[i]  # the initial value
+        late.clear()
 
-    def _get_lock(self, ledger: Ledger) -> threading.Lock:
-        """Get or create lock for ledger. Must hold _global_lock when calling."""
-        if ledger not in self._locks:
-            self._locks[ledger] = threading.Lock()
-        return self._locks[ledger]
+    def spend_in_window(self, now: float, window: float | None) -> _Units:
+        """Prune to the window ending at now; return committed + reserved.
 
-    def _prune(
+        The single entry point for check/reserve, so each only pays for
+        the pruning steps that have something to drop.
+        """
+        if window is not None:
+            cutoff = now - window
+            ts = self.ts
+            if (ts and ts[0] < cutoff) or self.late:
+                self.prune(cutoff)
+            if self.res_keys:
+                self.reserved_since(cutoff)
+        elif self.res_split:
+            self.reserved_since(None)
+        return self.total + self.reserved
+
+    def check_and_add_many(
         self,
-        events: list[SpendEvent],
         now: float,
-        window: float | None,
-    ) -> list[SpendEvent]:
-        """Remove events outside the window."""
-        if window is None:
-            return list(events)
-        cutoff = now - window
-        return [e for e in events if e.ts >= cutoff]
+        all_units: Sequence[tuple[_Units, int]],
+        budget: Budget,
+    ) -> list[tuple[_Units, int, bool]]:
+        """Check and record each (units, exp) in order; (spent, exp, allowed) each."""
+        max_units = budget._max_units
+        outcomes: list[tuple[_Units, int, bool]] = []
+        current_spend = self.spend_in_window(now, budget.window)
+        for units, exp in all_units:
+            if current_spend + units > max_units:
+                outcomes.append((current_spend, self.exp, False))
+                continue
+            self.add(now, units, exp)
+            current_spend += units
+            outcomes.append((current_spend, self.exp, True))
+        return outcomes
+
+    def reserve(self, res: Reservation, exp: int) -> None:
+        """Track a new reservation."""
+        if exp < self.exp:
+            self.exp = exp
+        self.reservations[res.id] = res
+        keys = self.res_keys
+        key = (res.ts, res.id)
+        if not keys or keys[-1] < key:
+            keys.append(key)
+            i = len(keys) - 1
+        else:
+            i = bisect_left(keys, key)
+            keys.insert(i, key)
+        if i < self.res_split:
+            self.res_split += 1  # before the last cutoff; the next call decides
+        else:
+            self.reserved += res.amount
+
+    def unreserve(self, res_id: str) -> None:
+        """Stop tracking a committed or released reservation."""
+        res = self.reservations.pop(res_id, None)
+        if res is None:
+            return
+        keys = self.res_keys
+        i = bisect_left(keys, (res.ts, res_id))
+        del keys[i]
+        if i < self.res_split:
+            self.res_split -= 1
+        else:
+            self.reserved -= res.amount
+        if not keys and not self.ts and not self.late:
+            self.exp = 0
+
+    def reserved_since(self, cutoff: float | None) -> _Units:
+        """Open reservations at or after cutoff (None = all).
+
+        Moves the split to cutoff first, in either direction; reservations
+        before it stop counting but are never dropped.
+        """
+        keys = self.res_keys
+        split = 0 if cutoff is None else bisect_left(keys, (cutoff,))
+        old = self.res_split
+        if split != old:
+            reservations = self.reservations
+            if split > old:
+                self.reserved -= sum(reservations[rid].amount for _, rid in keys[old:split])
+            else:
+                self.reserved += sum(reservations[rid].amount for _, rid in keys[split:old])
+            self.res_split = split
+        return self.reserved
 
-    def _get_reserved_locked(self, ledger: Ledger, now: float, window: float | None) -> Decimal:
-        """Sum of active reservations for ledger within window.
 
-        Must hold _global_lock when calling (to safely iterate _reservations).
-        """
-        total = Decimal("0")
-        cutoff = now - window if window else None
-        for res in self._reservations.values():
-            if res.ledger == ledger and (cutoff is None or res.ts >= cutoff):
-                total += res.amount
-        return total
+# Shard count for MemoryStore locks; a power of two so hash & mask picks one.
+_SHARDS = 64
+_SHARD_MASK = _SHARDS - 1
+
+
+class MemoryStore:
+    """Thread-safe in-memory spend store with reservation support.
+
+    Ledgers are split across a fixed set of shards, each with its own lock
+    and ledger map, so unrelated ledgers never contend on one lock. Request
+    paths hold a single shard lock at a time; clear_all() takes every shard
+    lock in index order.
+
+    The id -> Reservation map is shared across shards and only touched with
+    single dict operations (insert, lookup, pop), which are atomic. Commit
+    and release look a reservation up to find its shard, then pop it under
+    that shard's lock, so they are ordered against clear(). Shard locks
+    cover only the integer bookkeeping; Decimal conversion of results
+    happens after release.
+
+    Reservation ids are a random per-store prefix plus a counter: unique
+    within the process, and far cheaper than a uuid4 per reservation.
+    """
+
+    __slots__ = ("_ledgers", "_reservations", "_locks", "_res_prefix", "_res_ids")
+
+    def __init__(self) -> None:
+        self._ledgers: tuple[dict[Ledger, _LedgerState], ...] = tuple(
+            {} for _ in range(_SHARDS)
+        )
+        self._reservations: dict[str, Reservation] = {}
+        self._locks = tuple(threading.Lock() for _ in range(_SHARDS))
+        self._res_prefix = secrets.token_hex(4)
+        self._res_ids = itertools.count(1)  # next() is atomic, no lock needed
+
+    def _get_state(self, shard: int, ledger: Ledger) -> _LedgerState:
+        """Get or create spend state for ledger. Must hold the shard lock."""
+        ledgers = self._ledgers[shard]
+        state = ledgers.get(ledger)
+        if state is None:
+            state = ledgers[ledger] = _LedgerState()
+        return state
 
     def check_and_reserve(
         self,
@@ -214,20 +413,38 @@ class MemoryStore:
         amount: Decimal,
         budget: Budget,
     ) -> tuple[Decimal, bool]:
-        with self._global_lock:
-            lock = self._get_lock(ledger)
-            with lock:
-                events = self._ledgers.get(ledger, [])
-                pruned = self._prune(events, now, budget.window)
-                committed = sum((e.amount for e in pruned), Decimal("0"))
-                reserved = self._get_reserved_locked(ledger, now, budget.window)
-                current_spend = committed + reserved
-                if current_spend + amount > budget.max_spend:
-                    self._ledgers[ledger] = pruned
-                    return current_spend, False
-                pruned.append(SpendEvent(ts=now, amount=amount))
-                self._ledgers[ledger] = pruned
-                return current_spend + amount, True
+        units, exp = _to_units(amount)
+        shard = hash(ledger) & _SHARD_MASK
+        with self._locks[shard]:
+            state = self._get_state(shard, ledger)
+            current_spend = state.spend_in_window(now, budget.window)
+            allowed = current_spend + units <= budget._max_units
+            if allowed:
+                state.add(now, units, exp)
+                current_spend += units
+            exp = state.exp
+        return _from_units(current_spend, exp), allowed
+
+    def check_and_reserve_many(
+        self,
+        ledger: Ledger,
+        now: float,
+        amounts: Sequence[Decimal],
+        budget: Budget,
+    ) -> list[tuple[Decimal, bool]]:
+        """Batch check_and_reserve: one lock acquisition and prune per batch.
+
+        Amounts are evaluated in order, exactly as successive
+        check_and_reserve() calls at `now` would be.
+        """
+        all_units = [_to_units(amount) for amount in amounts]
+        shard = hash(ledger) & _SHARD_MASK
+        with self._locks[shard]:
+            state = self._get_state(shard, ledger)
+            outcomes = state.check_and_add_many(now, all_units, budget)
+        return [
+            (_from_units(spent, exp), allowed) for spent, exp, allowed in outcomes
+        ]
 
     def reserve(
         self,
@@ -236,39 +453,57 @@ class MemoryStore:
         amount: Decimal,
         budget: Budget,
     ) -> tuple[str | None, Decimal]:
-        with self._global_lock:
-            lock = self._get_lock(ledger)
-            with lock:
-                events = self._ledgers.get(ledger, [])
-                pruned = self._prune(events, now, budget.window)
-                self._ledgers[ledger] = pruned
-                committed = sum((e.amount for e in pruned), Decimal("0"))
-                reserved = self._get_reserved_locked(ledger, now, budget.window)
-                current_spend = committed + reserved
-                if current_spend + amount > budget.max_spend:
-                    return None, current_spend
-                res_id = uuid4().hex
-                self._reservations[res_id] = Reservation(
-                    id=res_id, ledger=ledger, ts=now, amount=amount,
-                )
-                return res_id, current_spend + amount
+        units, exp = _to_units(amount)
+        shard = hash(ledger) & _SHARD_MASK
+        with self._locks[shard]:
+            state = self._get_state(shard, ledger)
+            current_spend = state.spend_in_window(now, budget.window)
+            if current_spend + units > budget._max_units:
+                res_id = None
+            else:
+                res_id = f"{self._res_prefix}{next(self._res_ids):016x}"
+                res = Reservation(res_id, ledger, now, units)
+                self._reservations[res_id] = res
+                state.reserve(res, exp)
+                current_spend += units
+            exp = state.exp
+        return res_id, _from_units(current_spend, exp)
+
+    def _claim(self, reservation_id: str) -> tuple[int, Reservation]:
+        """Find a reservation's shard. Pop it with _pop() under that lock."""
+        try:
+            res = self._reservations[reservation_id]
+        except KeyError:
+            raise KeyError(f"Reservation not found: {reservation_id}") from None
+        return hash(res.ledger) & _SHARD_MASK, res
+
+    def _pop(self, reservation_id: str, res: Reservation) -> None:
+        """Remove a claimed reservation. Must hold its shard lock.
+
+        Popping under the lock orders it against clear(): a reservation the
+        clear already dropped is not found, rather than committed into a
+        freshly re-created ledger. Of two racing commit/release calls,
+        exactly one pops it.
+        """
+        if self._reservations.pop(reservation_id, None) is not res:
+            raise KeyError(f"Reservation not found: {reservation_id}")
 
     def commit(self, reservation_id: str, actual: Decimal) -> None:
-        with self._global_lock:
-            if reservation_id not in self._reservations:
-                raise KeyError(f"Reservation not found: {reservation_id}")
-            res = self._reservations.pop(reservation_id)
-            lock = self._get_lock(res.ledger)
-            with lock:
-                events = self._ledgers.get(res.ledger, [])
-                events.append(SpendEvent(ts=res.ts, amount=actual))
-                self._ledgers[res.ledger] = events
+        units, exp = _to_units(actual)
+        shard, res = self._claim(reservation_id)
+        with self._locks[shard]:
+            self._pop(reservation_id, res)
+            state = self._get_state(shard, res.ledger)
+            state.unreserve(reservation_id)
+            state.add(res.ts, units, exp)
 
     def release(self, reservation_id: str) -> None:
-        with self._global_lock:
-            if reservation_id not in self._reservations:
-                raise KeyError(f"Reservation not found: {reservation_id}")
-            del self._reservations[reservation_id]
+        shard, res = self._claim(reservation_id)
+        with self._locks[shard]:
+            self._pop(reservation_id, res)
+            state = self._ledgers[shard].get(res.ledger)
+            if state is not None:
+                state.unreserve(reservation_id)
 
     def get_spend(
         self,
@@ -276,32 +511,47 @@ class MemoryStore:
         now: float,
         window: float | None,
     ) -> Decimal:
-        with self._global_lock:
-            lock = self._get_lock(ledger)
-            with lock:
-                events = self._ledgers.get(ledger, [])
-                pruned = self._prune(events, now, window)
-                committed = sum((e.amount for e in pruned), Decimal("0"))
-                reserved = self._get_reserved_locked(ledger, now, window)
-                return committed + reserved
+        shard = hash(ledger) & _SHARD_MASK
+        with self._locks[shard]:
+            state = self._ledgers[shard].get(ledger)
+            if state is None:
+                return _ZERO
+            if window is None:
+                spent = state.total + state.reserved_since(None)
+            else:
+                cutoff = now - window
+                spent = state.spent_since(cutoff) + state.reserved_since(cutoff)
+            exp = state.exp
+        return _from_units(spent, exp)
 
     def clear(self, ledger: Ledger) -> None:
-        with self._global_lock:
-            lock = self._get_lock(ledger)
-            with lock:
-                self._ledgers.pop(ledger, None)
-                to_remove = [
-                    rid for rid, res in self._reservations.items()
-                    if res.ledger == ledger
-                ]
-                for rid in to_remove:
-                    del self._reservations[rid]
+        shard = hash(ledger) & _SHARD_MASK
+        with self._locks[shard]:
+            state = self._ledgers[shard].pop(ledger, None)
+            if state is not None:
+                for rid in state.reservations:
+                    self._reservations.pop(rid, None)
 
     def clear_all(self) -> None:
-        with self._global_lock:
-            self._ledgers.clear()
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            for ledgers in self._ledgers:
+                ledgers.clear()
             self._reservations.clear()
-            self._locks.clear()
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+class _AsyncLedgerState(_LedgerState):
+    """_LedgerState plus the asyncio.Lock that guards it."""
+
+    __slots__ = ("lock",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = asyncio.Lock()
 
 
 class AsyncMemoryStore:
@@ -309,42 +559,27 @@ class AsyncMemoryStore:
 
     Uses asyncio.Lock for coroutine-safe access. Suitable for
     single-process async deployments.
+
+    Each ledger's state owns its lock, so there is no store-wide lock to
+    take first: a call looks up (or creates) the state, then holds only its
+    lock. The id -> Reservation map is only touched by single dict
+    operations, which cannot interleave on one event loop.
     """
 
-    __slots__ = ("_ledgers", "_reservations", "_locks", "_global_lock")
+    __slots__ = ("_ledgers", "_reservations", "_res_prefix", "_res_ids")
 
     def __init__(self) -> None:
-        self._ledgers: dict[Ledger, list[SpendEvent]] = {}
+        self._ledgers: dict[Ledger, _AsyncLedgerState] = {}
         self._reservations: dict[str, Reservation] = {}
-        self._locks: dict[Ledger, asyncio.Lock] = {}
-        self._global_lock = asyncio.Lock()
+        self._res_prefix = secrets.token_hex(4)
+        self._res_ids = itertools.count(1)
 
-    async def _get_lock(self, ledger: Ledger) -> asyncio.Lock:
-        """Get or create lock for ledger. Must hold _global_lock when calling."""
-        if ledger not in self._locks:
-            self._locks[ledger] = asyncio.Lock()
-        return self._locks[ledger]
-
-    def _prune(
-        self,
-        events: list[SpendEvent],
-        now: float,
-        window: float | None,
-    ) -> list[SpendEvent]:
-        if window is None:
-            return list(events)
-        cutoff = now - window
-        return [e for e in events if e.ts >= cutoff]
-
-    def _get_reserved(
-        self, ledger: Ledger, now: float, window: float | None
-    ) -> Decimal:
-        total = Decimal("0")
-        cutoff = now - window if window else None
-        for res in self._reservations.values():
-            if res.ledger == ledger and (cutoff is None or res.ts >= cutoff):
-                total += res.amount
-        return total
+    def _get_state(self, ledger: Ledger) -> _AsyncLedgerState:
+        """Get or create spend state (and its lock) for ledger."""
+        state = self._ledgers.get(ledger)
+        if state is None:
+            state = self._ledgers.setdefault(ledger, _AsyncLedgerState())
+        return state
 
     async def check_and_reserve(
         self,
@@ -353,20 +588,30 @@ class AsyncMemoryStore:
         amount: Decimal,
         budget: Budget,
     ) -> tuple[Decimal, bool]:
-        async with self._global_lock:
-            lock = await self._get_lock(ledger)
-            async with lock:
-                events = self._ledgers.get(ledger, [])
-                pruned = self._prune(events, now, budget.window)
-                committed = sum((e.amount for e in pruned), Decimal("0"))
-                reserved = self._get_reserved(ledger, now, budget.window)
-                current_spend = committed + reserved
-                if current_spend + amount > budget.max_spend:
-                    self._ledgers[ledger] = pruned
-                    return current_spend, False
-                pruned.append(SpendEvent(ts=now, amount=amount))
-                self._ledgers[ledger] = pruned
-                return current_spend + amount, True
+        units, exp = _to_units(amount)
+        state = self._get_state(ledger)
+        async with state.lock:
+            current_spend = state.spend_in_window(now, budget.window)
+            if current_spend + units > budget._max_units:
+                return _from_units(current_spend, state.exp), False
+            state.add(now, units, exp)
+            return _from_units(current_spend + units, state.exp), True
+
+    async def check_and_reserve_many(
+        self,
+        ledger: Ledger,
+        now: float,
+        amounts: Sequence[Decimal],
+        budget: Budget,
+    ) -> list[tuple[Decimal, bool]]:
+        """Async version of MemoryStore.check_and_reserve_many()."""
+        all_units = [_to_units(amount) for amount in amounts]
+        state = self._get_state(ledger)
+        async with state.lock:
+            outcomes = state.check_and_add_many(now, all_units, budget)
+        return [
+            (_from_units(spent, exp), allowed) for spent, exp, allowed in outcomes
+        ]
 
     async def reserve(
         self,
@@ -375,39 +620,49 @@ class AsyncMemoryStore:
         amount: Decimal,
         budget: Budget,
     ) -> tuple[str | None, Decimal]:
-        async with self._global_lock:
-            lock = await self._get_lock(ledger)
-            async with lock:
-                events = self._ledgers.get(ledger, [])
-                pruned = self._prune(events, now, budget.window)
-                self._ledgers[ledger] = pruned
-                committed = sum((e.amount for e in pruned), Decimal("0"))
-                reserved = self._get_reserved(ledger, now, budget.window)
-                current_spend = committed + reserved
-                if current_spend + amount > budget.max_spend:
-                    return None, current_spend
-                res_id = uuid4().hex
-                self._reservations[res_id] = Reservation(
-                    id=res_id, ledger=ledger, ts=now, amount=amount,
-                )
-                return res_id, current_spend + amount
+        units, exp = _to_units(amount)
+        state = self._get_state(ledger)
+        async with state.lock:
+            current_spend = state.spend_in_window(now, budget.window)
+            if current_spend + units > budget._max_units:
+                return None, _from_units(current_spend, state.exp)
+            res_id = f"{self._res_prefix}{next(self._res_ids):016x}"
+            res = Reservation(res_id, ledger, now, units)
+            self._reservations[res_id] = res
+            state.reserve(res, exp)
+            return res_id, _from_units(current_spend + units, state.exp)
+
+    def _claim(self, reservation_id: str) -> Reservation:
+        try:
+            return self._reservations[reservation_id]
+        except KeyError:
+            raise KeyError(f"Reservation not found: {reservation_id}") from None
+
+    def _pop(self, reservation_id: str, res: Reservation) -> None:
+        """Remove a claimed reservation. Must hold its ledger's lock.
+
+        A clear() that ran while waiting for the lock has already dropped
+        it, so the commit/release fails instead of writing to a cleared
+        ledger.
+        """
+        if self._reservations.pop(reservation_id, None) is not res:
+            raise KeyError(f"Reservation not found: {reservation_id}")
 
     async def commit(self, reservation_id: str, actual: Decimal) -> None:
-        async with self._global_lock:
-            if reservation_id not in self._reservations:
-                raise KeyError(f"Reservation not found: {reservation_id}")
-            res = self._reservations.pop(reservation_id)
-            lock = await self._get_lock(res.ledger)
-            async with lock:
-                events = self._ledgers.get(res.ledger, [])
-                events.append(SpendEvent(ts=res.ts, amount=actual))
-                self._ledgers[res.ledger] = events
+        units, exp = _to_units(actual)
+        res = self._claim(reservation_id)
+        state = self._get_state(res.ledger)
+        async with state.lock:
+            self._pop(reservation_id, res)
+            state.unreserve(reservation_id)
+            state.add(res.ts, units, exp)
 
     async def release(self, reservation_id: str) -> None:
-        async with self._global_lock:
-            if reservation_id not in self._reservations:
-                raise KeyError(f"Reservation not found: {reservation_id}")
-            del self._reservations[reservation_id]
+        res = self._claim(reservation_id)
+        state = self._get_state(res.ledger)
+        async with state.lock:
+            self._pop(reservation_id, res)
+            state.unreserve(reservation_id)
 
     async def get_spend(
         self,
@@ -415,32 +670,34 @@ class AsyncMemoryStore:
         now: float,
         window: float | None,
     ) -> Decimal:
-        async with self._global_lock:
-            lock = await self._get_lock(ledger)
-            async with lock:
-                events = self._ledgers.get(ledger, [])
-                pruned = self._prune(events, now, window)
-                committed = sum((e.amount for e in pruned), Decimal("0"))
-                reserved = self._get_reserved(ledger, now, window)
-                return committed + reserved
+        state = self._ledgers.get(ledger)
+        if state is None:
+            return _ZERO
+        async with state.lock:
+            if window is None:
+                return _from_units(
+                    state.total + state.reserved_since(None), state.exp,
+                )
+            cutoff = now - window
+            return _from_units(
+                state.spent_since(cutoff) + state.reserved_since(cutoff),
+                state.exp,
+            )
 
     async def clear(self, ledger: Ledger) -> None:
-        async with self._global_lock:
-            lock = await self._get_lock(ledger)
-            async with lock:
-                self._ledgers.pop(ledger, None)
-                to_remove = [
-                    rid for rid, res in self._reservations.items()
-                    if res.ledger == ledger
-                ]
-                for rid in to_remove:
-                    del self._reservations[rid]
+        state = self._ledgers.get(ledger)
+        if state is None:
+            return
+        async with state.lock:
+            if self._ledgers.get(ledger) is state:
+                del self._ledgers[ledger]
+            for rid in state.reservations:
+                self._reservations.pop(rid, None)
 
     async def clear_all(self) -> None:
-        async with self._global_lock:
-            self._ledgers.clear()
-            self._reservations.clear()
-            self._locks.clear()
+        # No await in between: atomic with respect to other coroutines.
+        self._ledgers.clear()
+        self._reservations.clear()
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -631,14 +888,11 @@ class RedisStore:
         self._s_commit = client.register_script(_LUA_COMMIT)
         self._s_spend = client.register_script(_LUA_GET_SPEND)
 
-    def _ledger_path(self, ledger: Ledger) -> str:
-        return f"{ledger.namespace}:{ledger.resource}:{ledger.principal}"
-
     def _spends_key(self, ledger: Ledger) -> str:
-        return f"{self._prefix}:{self._ledger_path(ledger)}:spends"
+        return f"{self._prefix}:{ledger._path}:spends"
 
     def _res_key(self, ledger: Ledger) -> str:
-        return f"{self._prefix}:{self._ledger_path(ledger)}:res"
+        return f"{self._prefix}:{ledger._path}:res"
 
     def _resmap_key(self, res_id: str) -> str:
         return f"{self._prefix}:resmap:{res_id}"
@@ -677,7 +931,7 @@ class RedisStore:
             keys=[self._spends_key(ledger), self._res_key(ledger),
                   self._resmap_key(res_id)],
             args=[str(now), str(amount), str(budget.max_spend), window_arg,
-                  res_id, self._ledger_path(ledger)],
+                  res_id, ledger._path],
         )
 
         returned_id = result[0].decode() if isinstance(result[0], bytes) else result[0]
@@ -1,5 +1,6 @@
 """Async tests for BudgetGate."""
 
+import asyncio
 from decimal import Decimal
 
 import pytest
@@ -125,6 +126,19 @@ class TestAsyncCheck:
         d = await engine.async_check(ledger, Decimal("51.00"), budget)
         assert d.blocked
 
+    @pytest.mark.asyncio
+    async def test_check_many_evaluates_in_order(self):
+        engine = Engine(async_store=AsyncMemoryStore())
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        amounts = [Decimal("6.00"), Decimal("5.00"), Decimal("4.00")]
+        decisions = await engine.async_check_many(ledger, amounts, budget)
+        assert [d.allowed for d in decisions] == [True, False, True]
+        assert decisions[1].reason == BlockReason.BUDGET_EXCEEDED
+        assert decisions[2].spent_in_window == Decimal("10.00")
+        assert decisions[2].remaining == Decimal("0")
+
 
 # ═══════════════════════════════════════════════════════════════
 # async_enforce
@@ -340,3 +354,32 @@ class TestAsyncListeners:
 
         assert len(decisions) == 2
         assert all(d.status == Status.ALLOW for d in decisions)
+
+
+# ═══════════════════════════════════════════════════════════════
+# AsyncMemoryStore races
+# ═══════════════════════════════════════════════════════════════
+
+
+class TestAsyncMemoryStoreRaces:
+    """Interleavings that asyncio.Lock hand-off makes deterministic."""
+
+    @pytest.mark.asyncio
+    async def test_commit_queued_behind_clear_fails(self):
+        store = AsyncMemoryStore()
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+        res_id, _ = await store.reserve(ledger, 1.0, Decimal("5.00"), budget)
+
+        state = store._get_state(ledger)
+        async with state.lock:
+            # Both wait on the ledger lock; the clear is queued first.
+            clear = asyncio.create_task(store.clear(ledger))
+            await asyncio.sleep(0)
+            commit = asyncio.create_task(store.commit(res_id, Decimal("5.00")))
+            await asyncio.sleep(0)
+
+        await clear
+        with pytest.raises(KeyError):
+            await commit
+        assert await store.get_spend(ledger, 2.0, None) == Decimal("0")
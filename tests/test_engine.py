@@ -0,0 +1,367 @@
+"""Sync engine tests for BudgetGate."""
+
+import dataclasses
+import functools
+import os
+import pickle
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+from budgetgate import (
+    BlockReason,
+    Budget,
+    BudgetExceededError,
+    Decision,
+    Engine,
+    Ledger,
+    MemoryStore,
+    Status,
+    StoreErrorMode,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# ═══════════════════════════════════════════════════════════════
+# Ledger pickling
+# ═══════════════════════════════════════════════════════════════
+
+
+def _run_with_seed(seed: str, code: str, stdin: bytes = b"") -> bytes:
+    env = {**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        input=stdin, capture_output=True, env=env, check=True,
+    )
+    return proc.stdout
+
+
+class TestLedgerPickle:
+    """Ledgers survive pickling into a process with a different hash seed."""
+
+    def test_round_trip_preserves_fields(self):
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        loaded = pickle.loads(pickle.dumps(ledger))
+        assert loaded == ledger
+        assert hash(loaded) == hash(ledger)
+        assert str(loaded) == str(ledger)
+        assert loaded.key == ledger.key
+
+    def test_cross_process_lookup(self):
+        dumped = _run_with_seed("1", (
+            "import pickle, sys\n"
+            "from budgetgate import Ledger\n"
+            "sys.stdout.buffer.write(pickle.dumps(Ledger('openai', 'gpt-4', 'user:1')))\n"
+        ))
+        out = _run_with_seed("2", (
+            "import pickle, sys\n"
+            "from decimal import Decimal\n"
+            "from budgetgate import Budget, Engine, Ledger\n"
+            "loaded = pickle.loads(sys.stdin.buffer.read())\n"
+            "local = Ledger('openai', 'gpt-4', 'user:1')\n"
+            "engine = Engine()\n"
+            "budget = Budget(max_spend=Decimal('10.00'))\n"
+            "engine.register(local, budget)\n"
+            "print(hash(loaded) == hash(local), engine.budget_for(loaded) is budget)\n"
+        ), stdin=dumped)
+        assert out.split() == [b"True", b"True"]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Dataclass fields
+# ═══════════════════════════════════════════════════════════════
+
+
+class TestPublicFields:
+    """Cached derived values stay out of the dataclass field set."""
+
+    def test_ledger_fields(self):
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        names = [f.name for f in dataclasses.fields(ledger)]
+        assert names == ["namespace", "resource", "principal"]
+        assert dataclasses.astuple(ledger) == ("openai", "gpt-4", "user:1")
+        assert dataclasses.replace(ledger, principal="user:2").key == "bg:openai:gpt-4:user:2"
+
+    def test_budget_fields(self):
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+        assert "_max_units" not in dataclasses.asdict(budget)
+        assert dataclasses.astuple(budget)[:2] == (Decimal("10.00"), 60.0)
+
+    def test_budget_pickle_rebuilds_limit(self):
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+        loaded = pickle.loads(pickle.dumps(budget))
+        assert loaded == budget
+        assert loaded._max_units == budget._max_units
+
+
+# ═══════════════════════════════════════════════════════════════
+# guard
+# ═══════════════════════════════════════════════════════════════
+
+
+class TestGuard:
+    """@engine.guard decorator."""
+
+    def test_zero_arg_function(self):
+        engine = Engine()
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        @engine.guard(Ledger("ns", "res"), budget, cost=Decimal("1.00"))
+        def ping() -> str:
+            return "pong"
+
+        assert ping() == "pong"
+
+    def test_stacked_decorator_adding_parameters(self):
+        engine = Engine()
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        def repeat(fn):
+            @functools.wraps(fn)
+            def inner(times: int = 1) -> list[str]:
+                return [fn() for _ in range(times)]
+            return inner
+
+        @engine.guard(Ledger("ns", "res"), budget, cost=Decimal("1.00"))
+        @repeat
+        def ping() -> str:
+            return "pong"
+
+        assert ping(times=2) == ["pong", "pong"]
+        assert engine.get_remaining(Ledger("ns", "res"), budget) == Decimal("9.00")
+
+
+# ═══════════════════════════════════════════════════════════════
+# check_many
+# ═══════════════════════════════════════════════════════════════
+
+
+class FailingStore:
+    """Store that always raises, including for batches."""
+
+    def check_and_reserve(self, ledger, now, amount, budget):
+        raise ConnectionError("Store unavailable")
+
+    def check_and_reserve_many(self, ledger, now, amounts, budget):
+        raise ConnectionError("Store unavailable")
+
+
+class FailingStoreNoBatch:
+    """Store that always raises and has no batch method."""
+
+    def check_and_reserve(self, ledger, now, amount, budget):
+        raise ConnectionError("Store unavailable")
+
+
+class RecordingStoreNoBatch:
+    """Store with no batch method that records each call's timestamp."""
+
+    def __init__(self):
+        self.times: list[float] = []
+
+    def check_and_reserve(self, ledger, now, amount, budget):
+        self.times.append(now)
+        return Decimal("0"), True
+
+
+class TestCheckMany:
+    """check_many mirrors successive check() calls."""
+
+    def test_evaluates_in_order(self):
+        engine = Engine(store=MemoryStore())
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        amounts = [Decimal("6.00"), Decimal("5.00"), Decimal("4.00")]
+        decisions = engine.check_many(ledger, amounts, budget)
+        assert [d.allowed for d in decisions] == [True, False, True]
+        assert [d.requested for d in decisions] == amounts
+        assert decisions[1].reason == BlockReason.BUDGET_EXCEEDED
+        assert decisions[1].spent_in_window == Decimal("6.00")
+        assert decisions[2].spent_in_window == Decimal("10.00")
+        assert decisions[2].remaining == Decimal("0")
+
+    def test_exhausted_budget_reports_plain_zero(self):
+        engine = Engine(store=MemoryStore())
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        exact, over = engine.check_many(
+            ledger, [Decimal("10.00"), Decimal("1.00")], budget,
+        )
+        assert exact.allowed and over.blocked
+        assert exact.to_dict()["remaining"] == "0"
+        assert over.to_dict()["remaining"] == "0"
+
+    def test_matches_sequential_check(self):
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("5.00"), window=60.0)
+        amounts = [Decimal("2.50"), Decimal("3.00"), Decimal("2.50"), Decimal("0.01")]
+
+        batched = Engine(store=MemoryStore()).check_many(ledger, amounts, budget)
+        engine = Engine(store=MemoryStore())
+        sequential = [engine.check(ledger, a, budget) for a in amounts]
+        assert [d.to_dict() for d in batched] == [d.to_dict() for d in sequential]
+
+    def test_emits_each_decision_in_order(self):
+        decisions: list[Decision] = []
+        engine = Engine(store=MemoryStore())
+        engine.on_decision(decisions.append)
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        returned = engine.check_many(
+            ledger, [Decimal("6.00"), Decimal("5.00"), Decimal("4.00")], budget,
+        )
+        assert decisions == returned
+        assert [d.status for d in decisions] == [Status.ALLOW, Status.BLOCK, Status.ALLOW]
+
+    def test_fallback_reads_clock_once(self):
+        ticks = iter(range(100))
+        store = RecordingStoreNoBatch()
+        engine = Engine(store=store, clock=lambda: float(next(ticks)))
+        ledger = Ledger("openai", "gpt-4", "user:1")
+
+        engine.check_many(ledger, [Decimal("1.00")] * 3, Budget(max_spend=Decimal("10")))
+        assert store.times == [0.0, 0.0, 0.0]
+
+    def test_store_error_fails_whole_batch(self):
+        for store in (FailingStore(), FailingStoreNoBatch()):
+            engine = Engine(store=store)
+            ledger = Ledger("openai", "gpt-4", "user:1")
+            closed = Budget(
+                max_spend=Decimal("10.00"), on_store_error=StoreErrorMode.FAIL_CLOSED,
+            )
+            opened = Budget(
+                max_spend=Decimal("10.00"), on_store_error=StoreErrorMode.FAIL_OPEN,
+            )
+            amounts = [Decimal("1.00"), Decimal("2.00")]
+
+            blocked = engine.check_many(ledger, amounts, closed)
+            assert [d.blocked for d in blocked] == [True, True]
+            assert all(d.reason == BlockReason.STORE_ERROR for d in blocked)
+            assert all("fail-closed" in d.message for d in blocked)
+
+            allowed = engine.check_many(ledger, amounts, opened)
+            assert [d.allowed for d in allowed] == [True, True]
+            assert all("fail-open" in d.message for d in allowed)
+
+
+# ═══════════════════════════════════════════════════════════════
+# check
+# ═══════════════════════════════════════════════════════════════
+
+
+class TestCheck:
+    """Single-spend checks."""
+
+    def test_float_amount_fails_closed(self):
+        engine = Engine(store=MemoryStore())
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+        decision = engine.check(ledger, 0.1, budget)
+        assert decision.blocked
+        assert decision.reason == BlockReason.STORE_ERROR
+        assert engine.get_remaining(ledger, budget) == Decimal("10.00")
+
+
+# ═══════════════════════════════════════════════════════════════
+# Decision
+# ═══════════════════════════════════════════════════════════════
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _DataclassDecision:
+    """Decision as the frozen dataclass it used to be, for repr parity."""
+    status: Status
+    ledger: Ledger
+    budget: Budget
+    reason: BlockReason | None = None
+    message: str | None = None
+    spent_in_window: Decimal = Decimal("0")
+    requested: Decimal = Decimal("0")
+    remaining: Decimal = Decimal("0")
+
+
+class TestDecision:
+    """Decision's hand-written value semantics."""
+
+    def _block(self, engine=None):
+        engine = engine or Engine(store=MemoryStore())
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+        engine.check(ledger, Decimal("8.00"), budget)
+        return engine.check(ledger, Decimal("3.50"), budget)
+
+    def test_block_message_text(self):
+        decision = self._block()
+        assert decision.message == "Budget exceeded: 8.00 + 3.50 > 10.00"
+        assert decision.to_dict()["message"] == decision.message
+
+    def test_equal_decisions_compare_and_hash_equal(self):
+        a, b = self._block(), self._block()
+        assert a is not b
+        assert a == b
+        assert hash(a) == hash(b)
+        # A lazily formatted message equals the same text passed explicitly.
+        explicit = Decision(
+            a.status, a.ledger, a.budget, a.reason, a.message,
+            a.spent_in_window, a.requested, a.remaining,
+        )
+        assert explicit == a and hash(explicit) == hash(a)
+        assert a != Decision(Status.ALLOW, a.ledger, a.budget)
+        assert a != object()
+
+    def test_repr_matches_dataclass(self):
+        decision = self._block()
+        old = _DataclassDecision(
+            decision.status, decision.ledger, decision.budget, decision.reason,
+            decision.message, decision.spent_in_window, decision.requested,
+            decision.remaining,
+        )
+        assert repr(decision) == repr(old).replace("_DataclassDecision(", "Decision(", 1)
+
+    def test_pickle_round_trip(self):
+        decision = self._block()
+        loaded = pickle.loads(pickle.dumps(decision))
+        assert loaded == decision
+        assert loaded.message == "Budget exceeded: 8.00 + 3.50 > 10.00"
+        assert loaded.to_dict() == decision.to_dict()
+
+
+# ═══════════════════════════════════════════════════════════════
+# BudgetExceededError
+# ═══════════════════════════════════════════════════════════════
+
+
+class TestBudgetExceededError:
+    """The exception carries the decision's message like a normal init."""
+
+    def _raise(self, engine, budget):
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        decision = engine.check(ledger, Decimal("3.50"), budget)
+        try:
+            engine.enforce(decision)
+        except BudgetExceededError as exc:
+            return decision, exc
+        raise AssertionError("expected BudgetExceededError")
+
+    def test_budget_block(self):
+        engine = Engine(store=MemoryStore())
+        budget = Budget(max_spend=Decimal("2.00"), window=60.0)
+        decision, exc = self._raise(engine, budget)
+        assert exc.decision is decision
+        assert exc.args == (decision.message,)
+        assert str(exc) == "Budget exceeded: 0 + 3.50 > 2.00"
+        assert repr(exc) == f"BudgetExceededError({decision.message!r})"
+
+    def test_store_error_block(self):
+        engine = Engine(store=FailingStore())
+        budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+        decision, exc = self._raise(engine, budget)
+        assert decision.reason == BlockReason.STORE_ERROR
+        assert exc.args == (decision.message,)
+        assert str(exc) == "Store error (fail-closed): Store unavailable"
+
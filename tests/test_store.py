@@ -8,13 +8,16 @@ Usage:
 from __future__ import annotations
 
 import os
+import random
 import sys
+import threading
 import traceback
 from decimal import Decimal
 
 sys.path.insert(0, ".")
 from budgetgate import Budget, Ledger
-from budgetgate.store import MemoryStore
+from budgetgate import store as store_module
+from budgetgate.store import _SHIFT_LIMIT, MemoryStore, _LedgerState
 
 passed = 0
 failed = 0
@@ -81,6 +84,18 @@ def run_store_tests(make_store, label):
         total3 = s.get_spend(ledger, 3.0, 60.0)
         assert total3 == Decimal("2.00"), f"expected 2.00 after commit, got {total3}"
 
+    @_run_case(f"{label}: commit keeps reservation timestamp")
+    def _():
+        s = make_store()
+        res_id, _ = s.reserve(ledger, 1.0, Decimal("4.00"), budget)
+        s.check_and_reserve(ledger, 30.0, Decimal("3.00"), budget)
+        s.commit(res_id, Decimal("4.00"))
+        # At 62s the committed spend (ts=1) has left the window; ts=30 has not
+        total = s.get_spend(ledger, 62.0, 60.0)
+        assert total == Decimal("3.00"), f"expected 3.00, got {total}"
+        total, ok = s.check_and_reserve(ledger, 62.0, Decimal("7.00"), budget)
+        assert ok, f"expected allow after expiry, got block (total={total})"
+
     @_run_case(f"{label}: reserve and release")
     def _():
         s = make_store()
@@ -157,6 +172,342 @@ def run_store_tests(make_store, label):
 
 run_store_tests(MemoryStore, "MemoryStore")
 
+
+def run_memory_store_tests():
+    """MemoryStore-specific behavior (integer micro-unit accounting)."""
+    print("\n── MemoryStore internals ──")
+
+    ledger = Ledger("openai", "gpt-4", "user:1")
+    budget = Budget(max_spend=Decimal("10.00"), window=60.0)
+
+    @_run_case("MemoryStore: sub-micro amount is exact")
+    def _():
+        s = MemoryStore()
+        total, ok = s.check_and_reserve(ledger, 1.0, Decimal("0.0000025"), budget)
+        assert ok and total == Decimal("0.0000025"), f"got {total}, {ok}"
+        total, ok = s.check_and_reserve(ledger, 2.0, Decimal("1.00"), budget)
+        assert ok and total == Decimal("1.0000025"), f"got {total}, {ok}"
+        assert str(s.get_spend(ledger, 3.0, 60.0)) == "1.0000025"
+        results = s.check_and_reserve_many(
+            ledger, 4.0, [Decimal("0.0000001"), Decimal("9")], budget,
+        )
+        assert [ok for _, ok in results] == [True, False], results
+
+    @_run_case("MemoryStore: totals keep the amounts' scale")
+    def _():
+        s = MemoryStore()
+        total, _ = s.check_and_reserve(ledger, 1.0, Decimal("1.50"), budget)
+        assert str(total) == "1.50", f"expected '1.50', got {total!r}"
+        res_id, total = s.reserve(ledger, 2.0, Decimal("2"), budget)
+        assert str(total) == "3.50", f"expected '3.50', got {total!r}"
+        s.commit(res_id, Decimal("0.125"))
+        assert str(s.get_spend(ledger, 3.0, 60.0)) == "1.625"
+
+    @_run_case("MemoryStore: scale resets once the ledger is empty")
+    def _():
+        s = MemoryStore()
+        res_id, total = s.reserve(ledger, 1.0, Decimal("0.125"), budget)
+        assert str(total) == "0.125", f"got {total!r}"
+        s.release(res_id)
+        total, _ = s.check_and_reserve(ledger, 2.0, Decimal("1"), budget)
+        assert str(total) == "1", f"expected '1' after release, got {total!r}"
+
+    @_run_case("MemoryStore: float and str amounts rejected")
+    def _():
+        s = MemoryStore()
+        for bad in (0.1, "0.1"):
+            try:
+                s.check_and_reserve(ledger, 1.0, bad, budget)
+                raise AssertionError(f"expected TypeError for {bad!r}")
+            except TypeError:
+                pass
+        assert s.get_spend(ledger, 2.0, 60.0) == Decimal("0")
+        total, ok = s.check_and_reserve(ledger, 3.0, 2, budget)
+        assert ok and total == Decimal("2"), f"got {total}, {ok}"
+
+    @_run_case("MemoryStore: commit/release racing clear")
+    def _():
+        # A commit or release must pop its reservation under the ledger
+        # lock. If a clear slips in between, the commit would re-create the
+        # ledger and record spend for a reservation it no longer holds.
+        orphaned = []
+
+        class CheckedState(_LedgerState):
+            __slots__ = ()
+
+            def unreserve(self, res_id):
+                if res_id not in self.reservations:
+                    orphaned.append(res_id)
+                super().unreserve(res_id)
+
+        s = MemoryStore()
+        ledgers = [Ledger("openai", "gpt-4", f"user:{i}") for i in range(4)]
+        roomy = Budget(max_spend=Decimal("1000000000"), window=None)
+        stop = threading.Event()
+        failures = []
+
+        def worker(lg):
+            try:
+                n = 0
+                while not stop.is_set():
+                    res_id, _ = s.reserve(lg, float(n), Decimal("1"), roomy)
+                    try:
+                        if n % 2:
+                            s.commit(res_id, Decimal("1"))
+                        else:
+                            s.release(res_id)
+                    except KeyError:
+                        pass  # a clear dropped it first
+                    n += 1
+            except Exception as e:
+                failures.append(e)
+
+        def clearer():
+            for i in range(2000):
+                if i % 10:
+                    s.clear(ledgers[i % len(ledgers)])
+                else:
+                    s.clear_all()
+            stop.set()
+
+        saved_state, saved_interval = store_module._LedgerState, sys.getswitchinterval()
+        store_module._LedgerState = CheckedState
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(lg,)) for lg in ledgers]
+            threads.append(threading.Thread(target=clearer))
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            store_module._LedgerState = saved_state
+            sys.setswitchinterval(saved_interval)
+
+        assert not failures, failures
+        assert not orphaned, f"{len(orphaned)} committed after their clear"
+        assert not s._reservations, f"{len(s._reservations)} left open"
+        for shard in s._ledgers:
+            for state in shard.values():
+                assert not state.reservations and state.reserved_since(None) == 0
+        s.clear_all()
+        for lg in ledgers:
+            assert s.get_spend(lg, 0.0, None) == Decimal("0")
+
+    @_run_case("MemoryStore: int max_spend is coerced")
+    def _():
+        s = MemoryStore()
+        whole = Budget(max_spend=10, window=60.0)
+        assert whole.max_spend == Decimal("10")
+        _, ok = s.check_and_reserve(ledger, 1.0, Decimal("10"), whole)
+        assert ok, "expected allow (10 <= 10)"
+        _, ok = s.check_and_reserve(ledger, 2.0, Decimal("0.01"), whole)
+        assert not ok, "expected block (10.01 > 10)"
+        try:
+            Budget(max_spend=10.0)
+            raise AssertionError("expected TypeError")
+        except TypeError:
+            pass
+
+    @_run_case("MemoryStore: sub-micro max_spend is exact")
+    def _():
+        s = MemoryStore()
+        tight = Budget(max_spend=Decimal("1.0000009"), window=60.0)
+        _, ok = s.check_and_reserve(ledger, 1.0, Decimal("1.000000"), tight)
+        assert ok, "expected allow (1.000000 <= 1.0000009)"
+        _, ok = s.check_and_reserve(ledger, 2.0, Decimal("0.000001"), tight)
+        assert not ok, "expected block (1.000001 > 1.0000009)"
+
+    @_run_case("MemoryStore: check_and_reserve_many evaluates in order")
+    def _():
+        s = MemoryStore()
+        s.check_and_reserve(ledger, 1.0, Decimal("4.00"), budget)
+        amounts = [Decimal("3.00"), Decimal("5.00"), Decimal("2.00"), Decimal("1.50")]
+        results = s.check_and_reserve_many(ledger, 2.0, amounts, budget)
+        assert [ok for _, ok in results] == [True, False, True, False], results
+        assert [t for t, _ in results] == [
+            Decimal("7.00"), Decimal("7.00"), Decimal("9.00"), Decimal("9.00"),
+        ], results
+        assert s.get_spend(ledger, 3.0, 60.0) == Decimal("9.00")
+
+    @_run_case("MemoryStore: expired reservation stops counting but commits")
+    def _():
+        s = MemoryStore()
+        res_id, _ = s.reserve(ledger, 1.0, Decimal("8.00"), budget)
+        assert res_id is not None
+        # t=62: reservation from t=1 is outside the 60s window
+        total, ok = s.check_and_reserve(ledger, 62.0, Decimal("9.00"), budget)
+        assert ok and total == Decimal("9.00"), f"got {total}, {ok}"
+        assert s.get_spend(ledger, 62.0, None) == Decimal("17.00")
+        s.commit(res_id, Decimal("1.00"))
+        assert s.get_spend(ledger, 62.0, 60.0) == Decimal("9.00")
+        assert s.get_spend(ledger, 62.0, None) == Decimal("10.00")
+        _, ok = s.check_and_reserve(ledger, 63.0, Decimal("1.00"), budget)
+        assert ok, "expected allow (9.00 + 1.00 <= 10.00)"
+
+    @_run_case("MemoryStore: reservations made out of timestamp order")
+    def _():
+        s = MemoryStore()
+        b60 = Budget(max_spend=Decimal("100"), window=60.0)
+        b5 = Budget(max_spend=Decimal("100"), window=5.0)
+        s.reserve(ledger, 100.0, Decimal("10"), b60)
+        s.reserve(ledger, 50.0, Decimal("1"), b60)
+        # A short window ages both out, then a 60s window at t=120 must
+        # bring back the t=100 one even though t=50 was reserved later.
+        s.check_and_reserve(ledger, 200.0, Decimal("0"), b5)
+        total, ok = s.check_and_reserve(ledger, 120.0, Decimal("95"), b60)
+        assert (total, ok) == (Decimal("10"), False), f"got {total}, {ok}"
+        assert s.get_spend(ledger, 120.0, 60.0) == Decimal("10")
+        assert s.get_spend(ledger, 120.0, None) == Decimal("11")
+
+    @_run_case("MemoryStore: expired reservation still counts for longer windows")
+    def _():
+        s = MemoryStore()
+        hourly = Budget(max_spend=Decimal("20.00"), window=3600.0)
+        unbounded = Budget(max_spend=Decimal("20.00"), window=None)
+        res_id, _ = s.reserve(ledger, 1.0, Decimal("8.00"), budget)
+        # t=62: the 60s budget no longer counts the reservation from t=1
+        _, ok = s.check_and_reserve(ledger, 62.0, Decimal("9.00"), budget)
+        assert ok, "expected allow (reservation outside 60s window)"
+        total, ok = s.check_and_reserve(ledger, 63.0, Decimal("5.00"), hourly)
+        assert not ok and total == Decimal("17.00"), f"got {total}, {ok}"
+        _, ok = s.check_and_reserve(ledger, 64.0, Decimal("1.00"), budget)
+        assert ok, "expected allow (9.00 + 1.00 <= 10.00)"
+        res2, total = s.reserve(ledger, 65.0, Decimal("4.00"), unbounded)
+        assert res2 is None and total == Decimal("18.00"), f"got {res2}, {total}"
+        assert s.get_spend(ledger, 66.0, 3600.0) == Decimal("18.00")
+        assert s.get_spend(ledger, 66.0, 60.0) == Decimal("10.00")
+        s.release(res_id)
+        _, ok = s.check_and_reserve(ledger, 67.0, Decimal("2.00"), unbounded)
+        assert ok, "expected allow (10.00 + 2.00 <= 20.00)"
+
+
+run_memory_store_tests()
+
+
+def run_ledger_state_tests():
+    """_LedgerState out-of-order inserts: the `late` list and its fold."""
+    print("\n── _LedgerState internals ──")
+
+    def filled(n, start=100.0):
+        state = _LedgerState()
+        for k in range(n):
+            state.add(start + k, 1, 0)
+        return state
+
+    def model_since(model, cutoff):
+        return sum(amount for ts, amount in model if ts >= cutoff)
+
+    @_run_case("_LedgerState: shallow insert shifts in place")
+    def _():
+        state = filled(_SHIFT_LIMIT)
+        state.add(100.5, 3, 0)
+        assert not state.late, state.late
+        assert state.ts[1] == 100.5 and state.cum[-1] == _SHIFT_LIMIT + 3
+        assert state.spent_since(101.0) == _SHIFT_LIMIT - 1
+
+    @_run_case("_LedgerState: deep insert goes to late")
+    def _():
+        n = _SHIFT_LIMIT * 3
+        state = filled(n)
+        state.add(10.5, 5, 0)
+        assert state.late == [(10.5, 5)], state.late
+        assert len(state.ts) == n
+        assert state.total == n + 5
+        assert state.spent_since(10.5) == n + 5
+        assert state.spent_since(50.0) == n
+        assert state.spent_since(150.0) == n - 50
+
+    @_run_case("_LedgerState: prune drops expired late entries")
+    def _():
+        n = _SHIFT_LIMIT * 3
+        state = filled(n)
+        state.add(10.5, 5, 0)
+        state.add(60.5, 7, 0)
+        state.prune(50.0)
+        assert state.late == [(60.5, 7)], state.late
+        assert state.total == n + 7
+        assert state.spent_since(60.0) == n + 7
+        state.prune(110.0)
+        assert state.late == [], state.late
+        assert state.total == n - 10
+        assert state.spend_in_window(200.0, 90.0) == n - 10
+
+    @_run_case("_LedgerState: late folds back past sqrt(n)")
+    def _():
+        n = _SHIFT_LIMIT * 2
+        state = filled(n)
+        model = [(100.0 + k, 1) for k in range(n)]
+        folds_at = next(k for k in range(1, n) if k * k > n)
+        for k in range(folds_at):
+            # Alternate int units with sub-micro Decimal units.
+            amount = 2 if k % 2 else Decimal("2.5")
+            ts = 10.0 + k * 7.5
+            state.add(ts, amount, 0 if k % 2 else -7)
+            model.append((ts, amount))
+            if k < folds_at - 1:
+                assert len(state.late) == k + 1, state.late
+        assert state.late == [], "expected a fold"
+        assert state.ts == sorted(ts for ts, _ in model)
+        assert len(state.cum) == len(state.ts)
+        assert state.total == model_since(model, 0.0)
+        for cutoff in (0.0, 12.0, 40.0, 99.5, 100.0, 150.0, 1e9):
+            got = state.spent_since(cutoff)
+            assert got == model_since(model, cutoff), (cutoff, got)
+
+    @_run_case("_LedgerState: randomized against a list model")
+    def _():
+        rng = random.Random(1234)
+        saved = store_module._SHIFT_LIMIT
+        try:
+            for limit in (0, 2, 8):
+                store_module._SHIFT_LIMIT = limit
+                for _trial in range(40):
+                    state, model, t = _LedgerState(), [], 0.0
+                    for _step in range(300):
+                        op = rng.random()
+                        if op < 0.6:
+                            t += rng.random()
+                            ts = t if rng.random() < 0.5 else t - rng.random() * 30
+                            if rng.random() < 0.9:
+                                amount = rng.randint(1, 100)
+                            else:
+                                amount = Decimal(rng.randint(1, 100)).scaleb(-1)
+                            state.add(ts, amount, 0)
+                            model.append((ts, amount))
+                        elif op < 0.75:
+                            cutoff = t - rng.random() * 40
+                            state.spend_in_window(t, t - cutoff)
+                            model = [(x, a) for x, a in model if x >= cutoff]
+                        else:
+                            cutoff = t - rng.random() * 40
+                            got = state.spent_since(cutoff)
+                            assert got == model_since(model, cutoff), (limit, cutoff)
+                        assert state.total == model_since(model, float("-inf"))
+                        assert state.ts == sorted(state.ts)
+                        assert state.late == sorted(state.late)
+        finally:
+            store_module._SHIFT_LIMIT = saved
+
+    @_run_case("MemoryStore: commit deep behind the tail")
+    def _():
+        s = MemoryStore()
+        ledger = Ledger("openai", "gpt-4", "user:1")
+        budget = Budget(max_spend=Decimal("1000"), window=600.0)
+        res_id, _ = s.reserve(ledger, 1.0, Decimal("5"), budget)
+        for k in range(_SHIFT_LIMIT * 2):
+            s.check_and_reserve(ledger, 2.0 + k, Decimal("1"), budget)
+        s.commit(res_id, Decimal("3"))
+        n = _SHIFT_LIMIT * 2
+        assert s.get_spend(ledger, 300.0, 600.0) == Decimal(n + 3)
+        assert s.get_spend(ledger, 300.0, 298.5) == Decimal(n)
+        # t=602: the commit at t=1 has expired, the spends from t=2 have not
+        total, ok = s.check_and_reserve(ledger, 602.0, Decimal("0"), budget)
+        assert ok and total == Decimal(n), f"got {total}, {ok}"
+
+
+run_ledger_state_tests()
+
 # Optional Redis tests
 redis_url = os.environ.get("REDIS_URL")
 if redis_url: